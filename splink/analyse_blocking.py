@@ -5,7 +5,12 @@ from typing import TYPE_CHECKING, Union
 
 import pandas as pd
 
-from .blocking import BlockingRule, _sql_gen_where_condition, block_using_rules_sql
+from .blocking import (
+    BlockingRule,
+    _split_join_condition,
+    _sql_gen_where_condition,
+    block_using_rules_sql,
+)
 from .misc import calculate_cartesian, calculate_reduction_ratio
 
 # https://stackoverflow.com/questions/39740632/python-type-hinting-without-cyclic-imports
@@ -152,9 +157,11 @@ def count_comparisons_from_blocking_rule_pre_filter_conditions_sqls(
     linker: "Linker", blocking_rule: Union[str, "BlockingRule"]
 ):
     if isinstance(blocking_rule, str):
-        blocking_rule = BlockingRule(blocking_rule, sqlglot_dialect=linker._sql_dialect)
-
-    join_conditions = blocking_rule._equi_join_conditions
+        # There's no need to construct a full BlockingRule just to read the
+        # join conditions, which are cached on the blocking rule SQL
+        join_conditions, _ = _split_join_condition(blocking_rule, linker._sql_dialect)
+    else:
+        join_conditions = blocking_rule._equi_join_conditions
 
     l_cols_sel = []
     r_cols_sel = []
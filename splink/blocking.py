@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import hashlib
+from functools import lru_cache
 from sqlglot import parse_one
 from sqlglot.expressions import Join, Column
 from sqlglot.optimizer.eliminate_joins import join_condition
@@ -19,6 +20,36 @@ if TYPE_CHECKING:
     from .linker import Linker
 
 
+@lru_cache(maxsize=512)
+def _split_join_condition(blocking_rule: str, sqlglot_dialect: str = None):
+    # Splitting is keyed on the SQL rather than the BlockingRule object, so that
+    # e.g. blocking analysis, training and prediction share the result.
+    # Returns a tuple of (equi join keys, filter condition SQL)
+    def remove_table_prefix_sql(tree):
+        # join_condition extracts the keys from its own copy of the join
+        # condition, so they can be modified without affecting the parsed tree
+        for c in tree.find_all(Column):
+            del c.args["table"]
+        return tree.sql(dialect=sqlglot_dialect)
+
+    j = parse_one("INNER JOIN r", into=Join).on(
+        blocking_rule, dialect=sqlglot_dialect
+    )  # using sqlglot==11.4.1
+
+    source_keys, join_keys, filter_condition = join_condition(j)
+
+    rmtp = remove_table_prefix_sql
+
+    keys = tuple((rmtp(i), rmtp(j)) for (i, j) in zip(source_keys, join_keys))
+
+    if not filter_condition:
+        filter_sql = ""
+    else:
+        filter_sql = filter_condition.sql(sqlglot_dialect)
+
+    return keys, filter_sql
+
+
 def blocking_rule_to_obj(br):
     if isinstance(br, BlockingRule):
         return br
@@ -28,7 +59,7 @@ def blocking_rule_to_obj(br):
             raise ValueError("No blocking rule submitted...")
         sqlglot_dialect = br.get("sql_dialect", None)
         salting_partitions = br.get("salting_partitions", 1)
-        arrays_to_explode = br.get("arrays_to_explode", list())
+        arrays_to_explode = br.get("arrays_to_explode", None)
 
         return BlockingRule(
             blocking_rule, salting_partitions, sqlglot_dialect, arrays_to_explode
@@ -40,26 +71,45 @@ def blocking_rule_to_obj(br):
 
 
 class BlockingRule:
+    # Many blocking rules may be created, e.g. when analysing blocking, so avoid
+    # the overhead of a per-instance __dict__
+    __slots__ = (
+        "blocking_rule",
+        "preceding_rules",
+        "sqlglot_dialect",
+        "sql_dialect",
+        "salting_partitions",
+        "arrays_to_explode",
+        "ids_to_compare",
+        "_split_conditions_cache",
+        "_salted_blocking_rules_cache",
+        "_exclude_from_following_rules_sql_cache",
+    )
+
+    # Overridden by the dialect-specific blocking rules, see DialectBase
+    _sql_dialect = None
+
     def __init__(
         self,
         blocking_rule: BlockingRule | dict | str,
         salting_partitions=1,
         sqlglot_dialect: str = None,
-        arrays_to_explode: list = [],
+        arrays_to_explode: list = None,
     ):
-        if sqlglot_dialect:
-            self._sql_dialect = sqlglot_dialect
-
         self.blocking_rule = blocking_rule
         self.preceding_rules = []
         self.sqlglot_dialect = sqlglot_dialect
+        self.sql_dialect = sqlglot_dialect if sqlglot_dialect else self._sql_dialect
         self.salting_partitions = salting_partitions
-        self.arrays_to_explode = arrays_to_explode
+        # An empty tuple avoids sharing a mutable default between rules
+        self.arrays_to_explode = arrays_to_explode if arrays_to_explode else ()
         self.ids_to_compare = []
 
-    @property
-    def sql_dialect(self):
-        return None if not hasattr(self, "_sql_dialect") else self._sql_dialect
+        # The join conditions and the salted rules are cached, so the blocking
+        # rule and salting partitions must not be modified after construction
+        self._split_conditions_cache = None
+        self._salted_blocking_rules_cache = None
+        self._exclude_from_following_rules_sql_cache = {}
 
     @property
     def match_key(self):
@@ -77,10 +127,20 @@ class BlockingRule:
     def exclude_from_following_rules_sql(self, linker: Linker):
         unique_id_column = linker._settings_obj._unique_id_column_name
 
+        # This is called once for every rule that follows this one, so cache the
+        # result. ids_to_compare is only ever appended to, so its length
+        # identifies its contents
+        cache_key = (unique_id_column, len(self.ids_to_compare))
+        cache = self._exclude_from_following_rules_sql_cache
+        if cache_key not in cache:
+            cache[cache_key] = self._exclude_from_following_rules_sql(unique_id_column)
+        return cache[cache_key]
+
+    def _exclude_from_following_rules_sql(self, unique_id_column):
         if self.ids_to_compare:
 
             ids_to_compare_sql = " union all ".join(
-                [f"select * from {ids.physical_name}" for ids in self.ids_to_compare]
+                f"select * from {ids.physical_name}" for ids in self.ids_to_compare
             )
             # self.ids_to_compare[0].physical_name
 
@@ -99,28 +159,38 @@ class BlockingRule:
             return f"coalesce(({self.blocking_rule}),false)"
 
     def and_not_preceding_rules_sql(self, linker: Linker):
-        if not self.preceding_rules:
-            return ""
-        or_clauses = [
+        return _sql_gen_and_not_preceding_rules(
             br.exclude_from_following_rules_sql(linker) for br in self.preceding_rules
-        ]
-        previous_rules = " OR ".join(or_clauses)
-        return f"AND NOT ({previous_rules})"
+        )
 
     @property
     def salted_blocking_rules(self):
-        if self.salting_partitions == 1:
-            yield self.blocking_rule
-        else:
-            for n in range(self.salting_partitions):
-                yield f"{self.blocking_rule} and ceiling(l.__splink_salt * {self.salting_partitions}) = {n+1}"  # noqa: E501
+        if self._salted_blocking_rules_cache is None:
+            br = self.blocking_rule
+            partitions = self.salting_partitions
+            if partitions == 1:
+                self._salted_blocking_rules_cache = (br,)
+            else:
+                self._salted_blocking_rules_cache = tuple(
+                    f"{br} and ceiling(l.__splink_salt * {partitions}) = {n+1}"
+                    for n in range(partitions)
+                )
+        return self._salted_blocking_rules_cache
 
     @property
-    def _parsed_join_condition(self):
-        br = self.blocking_rule
-        return parse_one("INNER JOIN r", into=Join).on(
-            br, dialect=self.sqlglot_dialect
-        )  # using sqlglot==11.4.1
+    def _split_conditions(self):
+        """
+        Split the blocking rule into its equi join conditions and the remaining
+        filter conditions, using a single pass over the parsed join condition.
+
+        Returns:
+            tuple of (equi join keys, filter condition SQL)
+        """
+        if self._split_conditions_cache is None:
+            self._split_conditions_cache = _split_join_condition(
+                self.blocking_rule, self.sqlglot_dialect
+            )
+        return self._split_conditions_cache
 
     @property
     def _equi_join_conditions(self):
@@ -131,28 +201,8 @@ class BlockingRule:
         Returns:
             list of tuples like [(name, name), (substr(name,1,2), substr(name,2,3))]
         """
-
-        def remove_table_prefix(tree):
-            for c in tree.find_all(Column):
-                del c.args["table"]
-            return tree
-
-        j = self._parsed_join_condition
-
-        source_keys, join_keys, _ = join_condition(j)
-
-        keys = zip(source_keys, join_keys)
-
-        rmtp = remove_table_prefix
-
-        keys = [(rmtp(i), rmtp(j)) for (i, j) in keys]
-
-        keys = [
-            (i.sql(dialect=self.sqlglot_dialect), j.sql(self.sqlglot_dialect))
-            for (i, j) in keys
-        ]
-
-        return keys
+        keys, _ = self._split_conditions
+        return list(keys)
 
     @property
     def _filter_conditions(self):
@@ -160,12 +210,8 @@ class BlockingRule:
         # or "complex join conditions", but to capture the idea these are
         # filters that have to be applied post-creation of the pairwise record
         # comparison i've opted to call it a filter
-        j = self._parsed_join_condition
-        _, _, filter_condition = join_condition(j)
-        if not filter_condition:
-            return ""
-        else:
-            return filter_condition.sql(self.sqlglot_dialect)
+        _, filter_sql = self._split_conditions
+        return filter_sql
 
     def as_dict(self):
         "The minimal representation of the blocking rule"
@@ -183,7 +229,7 @@ class BlockingRule:
         return output
 
     def _as_completed_dict(self):
-        if not self.salting_partitions > 1 and self.sql_dialect == "spark":
+        if self.salting_partitions <= 1 and self.sql_dialect == "spark":
             return self.blocking_rule
         else:
             return self.as_dict()
@@ -206,12 +252,14 @@ class BlockingRule:
 
 
 def _sql_gen_where_condition(link_type, unique_id_cols):
+    # No need to generate the composite unique id expressions if they're not used
+    if link_type in ("two_dataset_link_only", "self_link"):
+        return " where 1=1 "
+
     id_expr_l = _composite_unique_id_from_nodes_sql(unique_id_cols, "l")
     id_expr_r = _composite_unique_id_from_nodes_sql(unique_id_cols, "r")
 
-    if link_type in ("two_dataset_link_only", "self_link"):
-        where_condition = " where 1=1 "
-    elif link_type in ["link_and_dedupe", "dedupe_only"]:
+    if link_type in ("link_and_dedupe", "dedupe_only"):
         where_condition = f"where {id_expr_l} < {id_expr_r}"
     elif link_type == "link_only":
         source_dataset_col = unique_id_cols[0]
@@ -223,6 +271,14 @@ def _sql_gen_where_condition(link_type, unique_id_cols):
     return where_condition
 
 
+def _sql_gen_and_not_preceding_rules(exclusion_clauses):
+    # Accepts any iterable of clauses, including a generator
+    previous_rules = " OR ".join(exclusion_clauses)
+    if not previous_rules:
+        return ""
+    return f"AND NOT ({previous_rules})"
+
+
 # flake8: noqa: C901
 def block_using_rules_sql(linker: Linker):
     """Use the blocking rules specified in the linker's settings object to
@@ -233,10 +289,7 @@ def block_using_rules_sql(linker: Linker):
     so that duplicate comparisons are not generated.
     """
 
-    if type(linker).__name__ in ["SparkLinker"]:
-        apply_salt = True
-    else:
-        apply_salt = False
+    apply_salt = linker._supports_salting
 
     settings_obj = linker._settings_obj
 
@@ -255,6 +308,14 @@ def block_using_rules_sql(linker: Linker):
         link_type, settings_obj._unique_id_input_columns
     )
 
+    # When exploding arrays, both sides are read from the same unnested table
+    if link_type == "two_dataset_link_only":
+        explode_where_condition = (
+            where_condition + " and l.source_dataset < r.source_dataset"
+        )
+    else:
+        explode_where_condition = where_condition
+
     # We could have had a single 'blocking rule'
     # property on the settings object, and avoided this logic but I wanted to be very
     # explicit about the difference between blocking for training
@@ -284,8 +345,17 @@ def block_using_rules_sql(linker: Linker):
     else:
         probability = ""
 
+    unique_id_col = settings_obj._unique_id_column_name
+    input_tablename_l = linker._input_tablename_l
+    input_tablename_r = linker._input_tablename_r
+
+    # The clauses excluding comparisons generated by the rules processed so far.
+    # These are usually exactly a rule's preceding rules, so are collected as we
+    # go rather than regenerated from the full chain of preceding rules each time
+    exclusion_clauses = []
+
     sqls = []
-    for br in blocking_rules:
+    for n, br in enumerate(blocking_rules):
 
         # Apply our salted rules to resolve skew issues. If no salt was
         # selected to be added, then apply the initial blocking rule.
@@ -294,47 +364,61 @@ def block_using_rules_sql(linker: Linker):
         else:
             salted_blocking_rules = [br.blocking_rule]
 
+        # Everything other than the salted rule itself is the same for every
+        # salting partition, so only generate it once per blocking rule
+        match_key = br.match_key
+        if br.preceding_rules == blocking_rules[:n]:
+            and_not_preceding_rules_sql = _sql_gen_and_not_preceding_rules(
+                exclusion_clauses
+            )
+        else:
+            and_not_preceding_rules_sql = br.and_not_preceding_rules_sql(linker)
+
+        if br.arrays_to_explode:
+            try:
+                input_dataframe = linker._intermediate_table_cache[
+                    "__splink__df_concat_with_tf"
+                ]
+            except KeyError:
+                input_dataframe = linker._initialise_df_concat_with_tf()
+            input_colnames = {col.name() for col in input_dataframe.columns}
+            arrays_to_explode_quoted = [
+                InputColumn(colname, sql_dialect=linker._sql_dialect).quote().name()
+                for colname in br.arrays_to_explode
+            ]
+            explode_sql = linker._gen_explode_sql(
+                "__splink__df_concat_with_tf",
+                br.arrays_to_explode,
+                list(input_colnames.difference(arrays_to_explode_quoted)),
+            )
+
         for salted_br in salted_blocking_rules:
             if not br.arrays_to_explode:
                 sql = f"""
                 select
                 {sql_select_expr}
-                , '{br.match_key}' as match_key
+                , '{match_key}' as match_key
                 {probability}
-                from {linker._input_tablename_l} as l
-                inner join {linker._input_tablename_r} as r
+                from {input_tablename_l} as l
+                inner join {input_tablename_r} as r
                 on
                 ({salted_br})
                 {where_condition}
-                {br.and_not_preceding_rules_sql(linker)}
+                {and_not_preceding_rules_sql}
                 """
             else:
-                try:
-                    input_dataframe = linker._intermediate_table_cache[
-                        "__splink__df_concat_with_tf"
-                    ]
-                except KeyError:
-                    input_dataframe = linker._initialise_df_concat_with_tf()
-                input_colnames = {col.name() for col in input_dataframe.columns}
-                arrays_to_explode_quoted = [
-                    InputColumn(colname, sql_dialect=linker._sql_dialect).quote().name()
-                    for colname in br.arrays_to_explode
-                ]
-                linker._enqueue_sql(
-                    f"{linker._gen_explode_sql('__splink__df_concat_with_tf',br.arrays_to_explode,list(input_colnames.difference(arrays_to_explode_quoted)))}",
-                    "__splink__df_concat_with_tf_unnested",
-                )
-                unique_id_col = settings_obj._unique_id_column_name
-
-                if link_type == "two_dataset_link_only":
-                    where_condition = (
-                        where_condition + " and l.source_dataset < r.source_dataset"
-                    )
+                # The pipeline is consumed when it is executed, so the explode
+                # step must be enqueued again for every salting partition
+                linker._enqueue_sql(explode_sql, "__splink__df_concat_with_tf_unnested")
 
                 # ensure that table names are unique
                 if apply_salt:
                     to_hash = (salted_br + linker._cache_uid).encode("utf-8")
-                    salt_id = "salt_id_" + hashlib.sha256(to_hash).hexdigest()[:9]
+                    # Only used as a short fingerprint, so needn't be cryptographic
+                    salt_id = (
+                        "salt_id_"
+                        + hashlib.blake2b(to_hash, digest_size=8).hexdigest()[:9]
+                    )
                 else:
                     salt_id = ""
 
@@ -342,20 +426,23 @@ def block_using_rules_sql(linker: Linker):
                     f"""
                     select distinct l.{unique_id_col} as {unique_id_col}_l,r.{unique_id_col} as {unique_id_col}_r
                     from __splink__df_concat_with_tf_unnested as l inner join __splink__df_concat_with_tf_unnested as r on ({salted_br})
-                    {where_condition} {br.and_not_preceding_rules_sql(linker)}""",
-                    f"ids_to_compare_blocking_rule_{br.match_key}{salt_id}",
+                    {explode_where_condition} {and_not_preceding_rules_sql}""",
+                    f"ids_to_compare_blocking_rule_{match_key}{salt_id}",
                 )
                 ids_to_compare = linker._execute_sql_pipeline([input_dataframe])
                 br.ids_to_compare.append(ids_to_compare)
                 sql = f"""
-                    select {sql_select_expr}, '{br.match_key}' as match_key
+                    select {sql_select_expr}, '{match_key}' as match_key
                     {probability}
                     from {ids_to_compare.physical_name} as pairs
-                    left join {linker._input_tablename_l} as l on pairs.{unique_id_col}_l=l.{unique_id_col}
-                    left join {linker._input_tablename_r} as r on pairs.{unique_id_col}_r=r.{unique_id_col}
+                    left join {input_tablename_l} as l on pairs.{unique_id_col}_l=l.{unique_id_col}
+                    left join {input_tablename_r} as r on pairs.{unique_id_col}_r=r.{unique_id_col}
                 """
             sqls.append(sql)
 
+        # Generated after the salt loop, as this depends on br.ids_to_compare
+        exclusion_clauses.append(br.exclude_from_following_rules_sql(linker))
+
     if (
         linker._two_dataset_link_only
         and not linker._find_new_matches_mode
@@ -386,5 +473,5 @@ def block_using_rules_sql(linker: Linker):
         """
         linker._enqueue_sql(sql, f"__splink__df_concat_with_tf{sample_switch}_right")
 
-    sql = "union all".join(sqls)
+    sql = " union all ".join(sqls)
     return sql
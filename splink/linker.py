@@ -388,6 +388,11 @@ class Linker:
             f"infinity sql expression not available for {type(self)}"
         )
 
+    @property
+    def _supports_salting(self):
+        # Whether the backend applies salting_partitions when blocking
+        return False
+
     def _random_sample_sql(
         self, proportion, sample_size, seed=None, table=None, unique_id=None
     ):
@@ -410,6 +410,10 @@ class SparkLinker(Linker):
     def _infinity_expression(self):
         return "'infinity'"
 
+    @property
+    def _supports_salting(self):
+        return True
+
     def register_table(self, input, table_name, overwrite=False):
         """
         Register a table to your backend database, to be used in one of the
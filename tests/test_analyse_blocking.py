@@ -360,6 +360,19 @@ def test_blocking_rule_accepts_different_dialects():
     assert br._equi_join_conditions == [("`hi THERE`", "`hi THERE`")]
 
 
+def test_blocking_rule_conditions_stable_on_repeated_access():
+    sql = "l.first_name = r.first_name and l.dob = r.dob and l.surname < r.surname"
+    expected_keys = [
+        ("first_name", "first_name"),
+        ("dob", "dob"),
+    ]
+    # Parsed trees are shared between rules with identical SQL
+    for br in [BlockingRule(sql, sqlglot_dialect="duckdb") for _ in range(2)]:
+        for _ in range(2):
+            assert br._equi_join_conditions == expected_keys
+            assert br._filter_conditions == "TRUE AND TRUE AND l.surname < r.surname"
+
+
 @mark_with_dialects_excluding()
 def test_cumulative_br_funs(test_helpers, dialect):
     helper = test_helpers[dialect]
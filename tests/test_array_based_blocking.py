@@ -6,6 +6,8 @@ from pyspark import SparkConf, SparkContext
 from pyspark.sql import SparkSession
 
 import splink.spark.comparison_library as cl
+from splink.blocking import block_using_rules_sql
+from splink.duckdb.linker import DuckDBLinker
 from splink.spark.linker import SparkLinker
 from tests.decorator import mark_with_dialects_including
 
@@ -253,3 +255,36 @@ def test_array_based_blocking_with_salted_rules():
     )
 
     assert predictions_no_salt == predictions_with_salt
+
+
+@mark_with_dialects_including("duckdb")
+def test_source_dataset_condition_only_applied_to_exploded_rules():
+    data_l = pd.DataFrame.from_dict(
+        [
+            {"unique_id": 1, "gender": "m", "postcode": ["2612", "2000"]},
+            {"unique_id": 2, "gender": "m", "postcode": ["2612", "2617"]},
+        ]
+    )
+    data_r = pd.DataFrame.from_dict(
+        [
+            {"unique_id": 4, "gender": "m", "postcode": ["2617", "2600"]},
+            {"unique_id": 6, "gender": "m", "postcode": ["2617", "2612", "2000"]},
+        ]
+    )
+    settings = {
+        "link_type": "link_only",
+        "blocking_rules_to_generate_predictions": [
+            {
+                "blocking_rule": "l.gender = r.gender and l.postcode = r.postcode",
+                "arrays_to_explode": ["postcode"],
+            },
+            "l.gender = r.gender",
+        ],
+    }
+    linker = DuckDBLinker([data_l, data_r], settings)
+    linker._initialise_df_concat_with_tf()
+
+    # The condition is needed to generate the ids_to_compare for the exploded
+    # rule, but must not leak into the SQL for the rules that follow it
+    sql = block_using_rules_sql(linker)
+    assert "source_dataset < r.source_dataset" not in sql
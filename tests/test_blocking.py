@@ -79,3 +79,19 @@ def test_simple_end_to_end(test_helpers, dialect):
     )
 
     linker.predict()
+
+
+def test_salted_blocking_rules():
+    br = BlockingRule("l.surname = r.surname", salting_partitions=3)
+    expected = [
+        f"l.surname = r.surname and ceiling(l.__splink_salt * 3) = {n}"
+        for n in [1, 2, 3]
+    ]
+    # Iterating the same result twice must not exhaust the salted rules
+    rules = br.salted_blocking_rules
+    assert list(rules) == expected
+    assert list(rules) == expected
+    assert br.salted_blocking_rules is rules
+
+    br = BlockingRule("l.surname = r.surname")
+    assert list(br.salted_blocking_rules) == ["l.surname = r.surname"]